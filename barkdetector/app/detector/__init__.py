@@ -1,6 +1,7 @@
 """Detector package for bark detection components."""
 
-from .yamnet import YAMNetBarkDetector, YAMNetInitializationError
+from .yamnet import YAMNetBarkDetector, YAMNetInitializationError, get_yamnet
 from .heuristic import HeuristicBarkDetector
 from .smoothing import EventSmoother
-from .audio import AudioStreamConfig, AudioStreamProvider
+from .audio import AudioStreamConfig, AudioStreamProvider, WindowBuffer
+from .inference import InferenceWorker
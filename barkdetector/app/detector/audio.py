@@ -2,16 +2,21 @@
 
 from __future__ import annotations
 
-import queue
+import math
 import threading
 import time
 from dataclasses import dataclass
-from typing import Generator, List, Optional, Tuple
+from typing import Generator, Iterator, List, Optional, Tuple
 
 import numpy as np
 import sounddevice as sd
 from loguru import logger
-from scipy.signal import resample_poly
+from scipy.signal import firwin, resample_poly
+
+# Blocks the callback can run ahead of the reader before the oldest is dropped.
+_RING_SLOTS = 8
+# How often the reader checks an empty ring; well below any sensible hop.
+_POLL_INTERVAL = 0.01
 
 
 @dataclass
@@ -32,6 +37,129 @@ class AudioStreamError(Exception):
     """Raised when the audio stream cannot be established."""
 
 
+class _ChunkRing:
+    """Single-producer/single-consumer ring of preallocated audio blocks.
+
+    The PortAudio callback is the only writer of ``_tail`` and the stream
+    reader the only writer of ``_head``; each is a plain int rebound under the
+    GIL, so neither side ever takes a lock or allocates. When the reader falls
+    a full ring behind, the oldest blocks are overwritten and skipped on the
+    next read: dropping old audio beats stalling the callback.
+    """
+
+    def __init__(self, slots: int, frames: int, channels: int) -> None:
+        self._slots = slots
+        self._buf = np.zeros((slots, frames, channels), dtype=np.float32)
+        # Byte views of each slot, built once, so a raw PortAudio buffer is
+        # copied in with a plain memoryview assignment -- a memcpy, with no
+        # ndarray wrapper created in the callback.
+        self._slot_bytes = [memoryview(self._buf[i]).cast("B") for i in range(slots)]
+        self._frame_bytes = channels * self._buf.itemsize
+        self._frames = [0] * slots
+        self._head = 0
+        self._tail = 0
+
+    def push(self, indata: object, frames: int) -> None:
+        """Copy one raw float32 callback block into the next slot (producer side)."""
+        tail = self._tail
+        slot = tail % self._slots
+        frames = min(frames, self._buf.shape[1])
+        nbytes = frames * self._frame_bytes
+        self._slot_bytes[slot][:nbytes] = memoryview(indata).cast("B")[:nbytes]
+        self._frames[slot] = frames
+        self._tail = tail + 1
+
+    def pop(self) -> Optional[np.ndarray]:
+        """Return the oldest unread block, or None when the ring is empty.
+
+        The result is a view into the ring; it stays valid until the producer
+        wraps around to the same slot, so callers must consume or copy it
+        before the next few blocks arrive.
+        """
+        head = self._head
+        tail = self._tail
+        if head == tail:
+            return None
+        if tail - head >= self._slots:
+            # The slot at ``head`` is the next one the callback overwrites, so
+            # a full ring is treated as overrun too rather than read torn.
+            skip_to = tail - self._slots + 1
+            logger.warning("Audio reader fell behind; dropped {} block(s)", skip_to - head)
+            head = skip_to
+        slot = head % self._slots
+        self._head = head + 1
+        return self._buf[slot, : self._frames[slot]]
+
+
+class WindowBuffer:
+    """Cuts a stream of chunks into overlapping fixed-size analysis windows.
+
+    Windows start every ``hop_samples``, exactly as when slicing one growing
+    array, but nothing is reallocated after construction. The ring is stored
+    twice, back to back, and every sample is written to both copies, so any
+    window is one contiguous slice: the windows are views, never gathered.
+    """
+
+    def __init__(self, window_samples: int, hop_samples: int, max_chunk_samples: int) -> None:
+        self.window_samples = window_samples
+        self.hop_samples = max(1, hop_samples)
+        self._size = window_samples + max(1, max_chunk_samples)
+        self._buf = np.zeros(2 * self._size, dtype=np.float32)
+        # Absolute sample counts since the first push.
+        self._written = 0
+        self._start = 0
+
+    def push(self, chunk: np.ndarray) -> None:
+        """Append a chunk of samples."""
+        size = chunk.shape[0]
+        retained = max(0, self._written - self._start)
+        if retained + size > self._size:
+            self._grow(retained + size)
+        self._write(chunk, self._written)
+        self._written += size
+
+    def windows(self) -> Iterator[np.ndarray]:
+        """Yield every complete window, oldest first.
+
+        Each window is a view that stays valid until the next push().
+        """
+        while self._written - self._start >= self.window_samples:
+            offset = self._start % self._size
+            yield self._buf[offset : offset + self.window_samples]
+            # A hop longer than the window cannot skip samples not yet seen.
+            self._start = min(self._start + self.hop_samples, self._written)
+
+    def _write(self, samples: np.ndarray, position: int) -> None:
+        size = self._size
+        begin = position % size
+        end = begin + samples.shape[0]
+        self._buf[begin:end] = samples
+        # Mirror into the other copy: the part that landed in the first half
+        # goes up by ``size``, any part that ran into the second half goes down.
+        if begin < size:
+            self._buf[begin + size : min(end, size) + size] = self._buf[begin : min(end, size)]
+        if end > size:
+            self._buf[max(begin, size) - size : end - size] = self._buf[max(begin, size) : end]
+
+    def _grow(self, needed: int) -> None:
+        # Only reached if a chunk is larger than the one sized for up front.
+        # Growth is geometric, so even a stream of ever-larger chunks costs
+        # amortised O(1) copies per sample; it is logged because it should
+        # not happen after startup.
+        retained = max(0, self._written - self._start)
+        offset = self._start % self._size
+        kept = self._buf[offset : offset + retained].copy()
+        logger.debug(
+            "Window buffer grew for a {}-sample chunk ({} -> {} samples)",
+            needed - retained,
+            self._size,
+            max(needed, 2 * self._size),
+        )
+        self._size = max(needed, 2 * self._size)
+        self._buf = np.zeros(2 * self._size, dtype=np.float32)
+        self._write(kept, self._written - retained)
+
+
 class AudioStreamProvider:
     """Provides resampled audio chunks ready for detection."""
 
@@ -39,6 +167,10 @@ class AudioStreamProvider:
         self.config = config
         self._stop_event = threading.Event()
         self._source_rate: Optional[int] = None
+        # Downmix target for multi-channel input, grown to the block size once.
+        self._mono_buf = np.zeros(0, dtype=np.float32)
+        # Short hops are zero-padded into this instead of a fresh np.pad array.
+        self._hop_buf = np.zeros(0, dtype=np.float32)
 
     @staticmethod
     def list_input_devices() -> List[Tuple[int, str, float, int]]:
@@ -67,21 +199,31 @@ class AudioStreamProvider:
 
         Each yielded chunk spans hop_seconds worth of audio at the target
         sample rate (e.g., 0.5 seconds -> 8000 samples at 16 kHz).
+
+        Chunks may share memory with the provider's internal buffers; copy to
+        keep one. Resampled or padded chunks stay valid until the next one is
+        requested. Mono input at the target rate is a view of a capture ring
+        slot and stays valid only until the callback wraps around to that
+        slot, which can happen while the consumer still holds it.
         """
         target_rate = self.config.sample_rate
         hop_samples_target = max(1, int(round(self.config.hop_seconds * target_rate)))
+        self._hop_buf = np.zeros(hop_samples_target, dtype=np.float32)
 
         while not self._stop_event.is_set():
-            queue_: "queue.Queue[np.ndarray]" = queue.Queue(maxsize=8)
-
             try:
-                stream, source_rate = self._open_stream(queue_)
+                stream, source_rate, ring = self._open_stream()
             except AudioStreamError as exc:
                 logger.error("Audio stream setup failed: {}", exc)
                 time.sleep(5.0)
                 continue
 
             self._source_rate = source_rate
+            resample_filter = (
+                self._design_resampler(source_rate, target_rate)
+                if source_rate != target_rate
+                else None
+            )
 
             logger.info(
                 "Audio stream started at {} Hz (target {} Hz) using device {}",
@@ -95,9 +237,9 @@ class AudioStreamProvider:
             try:
                 with stream:
                     while not self._stop_event.is_set():
-                        try:
-                            chunk = queue_.get(timeout=1.0)
-                        except queue.Empty:
+                        chunk = ring.pop()
+                        if chunk is None:
+                            time.sleep(_POLL_INTERVAL)
                             continue
 
                         if chunk.size == 0:
@@ -106,7 +248,9 @@ class AudioStreamProvider:
                         mono = self._to_mono(chunk)
 
                         if source_rate != target_rate:
-                            resampled = resample_poly(mono, target_rate, source_rate)
+                            resampled = resample_poly(
+                                mono, target_rate, source_rate, window=resample_filter
+                            )
                         else:
                             resampled = mono
 
@@ -117,7 +261,13 @@ class AudioStreamProvider:
                             # Pad or trim to maintain consistent chunk size.
                             resampled = self._pad_or_trim(resampled, hop_samples_target)
 
-                        yield resampled.astype(np.float32, copy=False)
+                        # The ring, the resampling filter and the padding all
+                        # preserve float32 and contiguity, so this is a no-op
+                        # that returns the same array. It pins down the contract
+                        # the consumers rely on: capture and the window buffer
+                        # both memcpy this one chunk, so a stray float64 or
+                        # strided result would otherwise be converted twice.
+                        yield np.ascontiguousarray(resampled, dtype=np.float32)
             except sd.PortAudioError as exc:
                 logger.error("Audio stream encountered an error: {}", exc)
                 time.sleep(2.0)
@@ -150,9 +300,7 @@ class AudioStreamProvider:
         )
         return None
 
-    def _open_stream(
-        self, queue_: "queue.Queue[np.ndarray]"
-    ) -> Tuple[sd.InputStream, int]:
+    def _open_stream(self) -> Tuple[sd.RawInputStream, int, _ChunkRing]:
         device = self._resolve_device()
         target_rate = self.config.sample_rate
         candidate_rates: List[int] = [target_rate]
@@ -168,15 +316,18 @@ class AudioStreamProvider:
         for rate in candidate_rates:
             try:
                 hop_samples = max(1, int(round(self.config.hop_seconds * rate)))
-                stream = sd.InputStream(
+                ring = _ChunkRing(_RING_SLOTS, hop_samples, self.config.channels)
+                # Raw stream: the callback gets PortAudio's buffer as-is rather
+                # than a freshly wrapped ndarray for every block.
+                stream = sd.RawInputStream(
                     device=device,
                     samplerate=rate,
                     blocksize=hop_samples,
                     channels=self.config.channels,
                     dtype="float32",
-                    callback=self._make_callback(queue_),
+                    callback=self._make_callback(ring),
                 )
-                return stream, rate
+                return stream, rate, ring
             except sd.PortAudioError as exc:
                 logger.warning(
                     "Failed to open audio stream at {} Hz (device {}): {}",
@@ -188,34 +339,53 @@ class AudioStreamProvider:
         raise AudioStreamError("Unable to open microphone stream at any supported rate")
 
     @staticmethod
-    def _make_callback(
-        queue_: "queue.Queue[np.ndarray]",
-    ) -> "sd.CallbackType":
+    def _make_callback(ring: _ChunkRing) -> "sd.CallbackType":
         def callback(indata, frames, time_info, status):  # type: ignore[override]
             if status:
                 logger.warning("Audio callback status: {}", status)
-            try:
-                queue_.put_nowait(indata.copy())
-            except queue.Full:
-                # Drop oldest sample to avoid blocking callback.
-                try:
-                    queue_.get_nowait()
-                    queue_.put_nowait(indata.copy())
-                except queue.Empty:
-                    pass
+            # Never block or allocate here: a slow callback is an xrun.
+            ring.push(indata, frames)
 
         return callback
 
+    @staticmethod
+    def _design_resampler(source_rate: int, target_rate: int) -> np.ndarray:
+        """Build the anti-aliasing FIR resample_poly would otherwise redesign per hop.
+
+        Same filter as resample_poly's default -- Kaiser (beta 5.0), half-length
+        of ten taps per unit of the larger rate factor -- so output is unchanged;
+        passing it in as ``window`` skips the firwin() call on every chunk.
+        """
+        g = math.gcd(source_rate, target_rate)
+        max_rate = max(target_rate // g, source_rate // g)
+        half_len = 10 * max_rate
+        return firwin(2 * half_len + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(
+            np.float32
+        )
+
     def _to_mono(self, chunk: np.ndarray) -> np.ndarray:
         if chunk.ndim == 1 or chunk.shape[1] == 1:
-            return np.squeeze(chunk).astype(np.float32, copy=False)
-        return np.mean(chunk, axis=1).astype(np.float32, copy=False)
-
-    @staticmethod
-    def _pad_or_trim(samples: np.ndarray, target_size: int) -> np.ndarray:
+            return np.squeeze(chunk)
+
+        frames, channels = chunk.shape
+        if self._mono_buf.size < frames:
+            self._mono_buf = np.empty(frames, dtype=np.float32)
+        mono = self._mono_buf[:frames]
+        if channels == 2:
+            np.add(chunk[:, 0], chunk[:, 1], out=mono)
+        else:
+            np.add.reduce(chunk, axis=1, out=mono)
+        mono *= 1.0 / channels
+        return mono
+
+    def _pad_or_trim(self, samples: np.ndarray, target_size: int) -> np.ndarray:
         if samples.size == target_size:
             return samples
         if samples.size > target_size:
             return samples[:target_size]
-        pad_width = target_size - samples.size
-        return np.pad(samples, (0, pad_width), mode="constant")
+        if self._hop_buf.size != target_size:
+            self._hop_buf = np.zeros(target_size, dtype=np.float32)
+        size = samples.size
+        self._hop_buf[:size] = samples
+        self._hop_buf[size:] = 0.0
+        return self._hop_buf
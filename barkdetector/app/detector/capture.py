@@ -2,16 +2,17 @@
 
 from __future__ import annotations
 
+import queue
 import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Deque, List, Optional
+from typing import List, Optional
 
 import numpy as np
+import soundfile as sf
 from loguru import logger
-from scipy.io import wavfile
 
 
 @dataclass
@@ -38,72 +39,73 @@ class _CaptureJob:
     post_samples: int
     file_path: Path
     start_ts: float
-    collected: List[np.ndarray] = field(default_factory=list)
+    post_audio: np.ndarray = field(init=False, repr=False)
+    filled: int = field(init=False, default=0)
 
-    @property
-    def collected_samples(self) -> int:
-        return sum(chunk.size for chunk in self.collected)
+    def __post_init__(self) -> None:
+        self.post_audio = np.empty(max(0, self.post_samples), dtype=np.float32)
 
     def add_samples(self, samples: np.ndarray) -> None:
-        if self.collected_samples >= self.post_samples:
-            return
-        needed = self.post_samples - self.collected_samples
-        if needed <= 0:
+        take = min(samples.size, self.post_audio.size - self.filled)
+        if take <= 0:
             return
-        self.collected.append(samples[:needed].copy())
+        self.post_audio[self.filled : self.filled + take] = samples[:take]
+        self.filled += take
 
     def ready(self) -> bool:
-        return self.collected_samples >= self.post_samples
+        return self.filled >= self.post_samples
 
     def final_audio(self) -> np.ndarray:
-        post = np.concatenate(self.collected, axis=0) if self.collected else np.array([], dtype=np.float32)
-        post = post[: self.post_samples]
-        return np.concatenate([self.pre_audio, post], axis=0)
+        return np.concatenate([self.pre_audio, self.post_audio[: self.filled]], axis=0)
 
 
 class AudioRingBuffer:
     """Fixed-size ring buffer for recent audio samples."""
 
     def __init__(self, capacity_samples: int) -> None:
-        from collections import deque
-
-        self.capacity = capacity_samples
-        self._buffer: Deque[np.ndarray] = deque()
-        self._total = 0
+        self.capacity = max(0, capacity_samples)
+        self._buf = np.zeros(self.capacity, dtype=np.float32)
+        self._write = 0
+        self._filled = 0
+        #: Samples ever written; the position just past the newest sample.
+        self.written = 0
 
     def extend(self, samples: np.ndarray) -> None:
-        chunk = samples.astype(np.float32, copy=True)
-        self._buffer.append(chunk)
-        self._total += chunk.size
-        self._trim()
-
-    def _trim(self) -> None:
-        while self._total > self.capacity and self._buffer:
-            excess = self._total - self.capacity
-            left = self._buffer[0]
-            if left.size <= excess:
-                self._buffer.popleft()
-                self._total -= left.size
-            else:
-                self._buffer[0] = left[excess:]
-                self._total -= excess
-
-    def recent(self, samples: int) -> np.ndarray:
-        samples = min(samples, self._total)
+        capacity = self.capacity
+        self.written += samples.size
+        if capacity == 0 or samples.size == 0:
+            return
+        if samples.size >= capacity:
+            # Only the newest ``capacity`` samples can survive anyway.
+            self._buf[:] = samples[-capacity:]
+            self._write = 0
+            self._filled = capacity
+            return
+
+        n = samples.size
+        w = self._write
+        first = min(n, capacity - w)
+        self._buf[w : w + first] = samples[:first]
+        self._buf[: n - first] = samples[first:]
+        self._write = (w + n) % capacity
+        self._filled = min(self._filled + n, capacity)
+
+    def recent(self, samples: int, end: Optional[int] = None) -> np.ndarray:
+        """Return up to ``samples`` samples ending at position ``end``.
+
+        ``end`` defaults to the newest sample; anything older than the ring
+        holds is silently left out.
+        """
+        lag = 0 if end is None else min(max(0, self.written - end), self._filled)
+        samples = min(samples, self._filled - lag)
         if samples <= 0:
             return np.zeros(0, dtype=np.float32)
 
-        result = np.zeros(samples, dtype=np.float32)
-        remaining = samples
-        idx = samples
-        for chunk in reversed(self._buffer):
-            if remaining <= 0:
-                break
-            take = min(chunk.size, remaining)
-            idx -= take
-            result[idx : idx + take] = chunk[-take:]
-            remaining -= take
-        return result
+        stop = (self._write - lag) % self.capacity
+        start = stop - samples
+        if start >= 0:
+            return self._buf[start:stop].copy()
+        return np.concatenate((self._buf[start:], self._buf[:stop]))
 
 
 class AudioCaptureManager:
@@ -126,8 +128,13 @@ class AudioCaptureManager:
         # and each delete down to the budget -- removing roughly twice what is
         # needed.
         self._prune_lock = threading.Lock()
+        # Finished jobs are written on their own thread so a slow disk never
+        # stalls detection. None is the shutdown sentinel.
+        self._write_q: "queue.Queue[Optional[_CaptureJob]]" = queue.Queue(maxsize=16)
+        self._writer_thread: Optional[threading.Thread] = None
         self._ensure_output_dir()
         self._start_cleanup_loop()
+        self._start_writer()
 
     def _ensure_output_dir(self) -> None:
         if not self.config.enabled:
@@ -139,7 +146,11 @@ class AudioCaptureManager:
             self._disabled = True
 
     def extend(self, samples: np.ndarray) -> List[Path]:
-        """Feed new samples into the ring buffer and active jobs."""
+        """Feed new samples into the ring buffer and active jobs.
+
+        Returns the captures that just became complete. They are written to
+        disk in the background, so a file may appear shortly afterwards.
+        """
         self._ring.extend(samples)
         completed: List[Path] = []
 
@@ -149,22 +160,30 @@ class AudioCaptureManager:
         for job in list(self._jobs):
             job.add_samples(samples)
             if job.ready():
-                try:
-                    self._write_job(job)
+                self._jobs.remove(job)
+                if self._queue_write(job):
                     completed.append(job.file_path)
-                except Exception as exc:  # pragma: no cover - file system dependent
-                    logger.error("Failed to write capture {}: {}", job.file_path, exc)
-                finally:
-                    self._jobs.remove(job)
         return completed
 
+    @property
+    def position(self) -> int:
+        """Samples received so far, for anchoring a later ``schedule_capture``."""
+        return self._ring.written
+
     def schedule_capture(
-        self, event_ts: float, device_id: str, score: float = 0.0
+        self,
+        event_ts: float,
+        device_id: str,
+        score: float = 0.0,
+        position: Optional[int] = None,
     ) -> Optional[Path]:
         """Schedule a capture around an event.
 
         The score goes in the filename so clips can be sorted and reviewed by
-        confidence when tuning the threshold.
+        confidence when tuning the threshold. ``position`` is where the event
+        happened in the stream (default: now); audio already received after
+        it counts towards the post-roll, so a decision that arrives late still
+        saves the same clip.
         """
         if self._disabled or not self.config.enabled:
             return None
@@ -181,32 +200,36 @@ class AudioCaptureManager:
         )
         file_path = self.config.out_dir / filename
 
-        pre_audio = self._ring.recent(pre_samples)
+        end = self._ring.written if position is None else position
+        pre_audio = self._ring.recent(pre_samples, end)
         job = _CaptureJob(pre_audio=pre_audio, post_samples=post_samples, file_path=file_path, start_ts=event_ts)
-        if post_samples == 0:
-            try:
-                self._write_job(job)
-                return file_path
-            except Exception as exc:  # pragma: no cover - filesystem dependent
-                logger.error("Failed to write immediate capture {}: {}", file_path, exc)
-                return None
+        caught_up = min(self._ring.written - end, post_samples)
+        if caught_up > 0:
+            job.add_samples(self._ring.recent(caught_up, end + caught_up))
+        if job.ready():
+            return file_path if self._queue_write(job) else None
 
         self._jobs.append(job)
         return file_path
 
     def _write_job(self, job: _CaptureJob) -> None:
+        # final_audio() returns a fresh array, so it is scaled in place: one
+        # float buffer for the whole export instead of one per step.
         audio = job.final_audio()
-        audio = np.clip(audio, -1.0, 1.0)
 
         applied_gain = 1.0
-        if self.config.normalize_peak > 0:
-            peak = float(np.max(np.abs(audio))) if audio.size else 0.0
+        if self.config.normalize_peak > 0 and audio.size:
+            peak = min(float(np.max(np.abs(audio))), 1.0)
             if peak > 1e-6:
                 applied_gain = self.config.normalize_peak / peak
-                audio = np.clip(audio * applied_gain, -1.0, 1.0)
 
-        int_audio = np.int16(audio * 32767)
-        wavfile.write(job.file_path, self.sample_rate, int_audio)
+        np.clip(audio, -1.0, 1.0, out=audio)
+        if applied_gain != 1.0:
+            np.multiply(audio, applied_gain, out=audio)
+            np.clip(audio, -1.0, 1.0, out=audio)
+        # libsndfile converts float to PCM_16 in C and writes the file in bulk.
+        # It does not saturate out-of-range floats by default, hence the clip.
+        sf.write(str(job.file_path), audio, self.sample_rate, subtype="PCM_16")
         if applied_gain != 1.0:
             logger.info(
                 "Saved capture to {} (playback gain {:.0f}x applied)",
@@ -219,6 +242,36 @@ class AudioCaptureManager:
         # events can blow the budget many times over between two sweeps.
         self._enforce_size_budget()
 
+    # Background writer -----------------------------------------------
+
+    def _start_writer(self) -> None:
+        if not self.config.enabled or self._disabled:
+            return
+        self._writer_thread = threading.Thread(
+            target=self._writer_loop, daemon=True, name="capture-writer"
+        )
+        self._writer_thread.start()
+
+    def _queue_write(self, job: _CaptureJob) -> bool:
+        # A finished job is never touched by the detection thread again, so it
+        # is handed over as-is rather than copied.
+        try:
+            self._write_q.put_nowait(job)
+            return True
+        except queue.Full:
+            logger.error("Capture writer is backlogged; dropping {}", job.file_path)
+            return False
+
+    def _writer_loop(self) -> None:
+        while True:
+            job = self._write_q.get()
+            if job is None:
+                return
+            try:
+                self._write_job(job)
+            except Exception as exc:  # pragma: no cover - file system dependent
+                logger.error("Failed to write capture {}: {}", job.file_path, exc)
+
     # Cleanup -----------------------------------------------------------
 
     def _enforce_size_budget(self) -> None:
@@ -315,3 +368,13 @@ class AudioCaptureManager:
     def stop_cleanup(self) -> None:
         """Signal the cleanup thread to stop."""
         self._cleanup_stop.set()
+
+    def stop(self) -> None:
+        """Stop the cleanup thread and finish writing queued captures."""
+        self.stop_cleanup()
+        if self._writer_thread is not None:
+            try:
+                self._write_q.put(None, timeout=1.0)
+            except queue.Full:
+                pass
+            self._writer_thread.join(timeout=10.0)
@@ -2,11 +2,28 @@
 
 from __future__ import annotations
 
+import math
 from dataclasses import dataclass
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 import numpy as np
-from scipy.signal import welch
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy import fft as sp_fft
+from scipy.signal import get_window
+
+# Welch segment length; segments overlap by half, as scipy's default does.
+_NPERSEG = 1024
+
+
+@dataclass
+class _WelchPlan:
+    window: np.ndarray
+    band_bins: slice
+    # Trapezoid weights with the one-sided density scale folded in.
+    band_weights: np.ndarray
+    # The window's own spectrum over the band, for detrending after the FFT;
+    # None when the window puts no energy there.
+    window_band: Optional[np.ndarray]
 
 
 @dataclass
@@ -24,6 +41,14 @@ class HeuristicBarkDetector:
         self.config = config
         self.sample_rate = sample_rate
         self.last_metrics: Dict[str, float] | None = None
+        # RMS gating compares squared quantities, so the hot path needs no sqrt.
+        self._rms_threshold_sq = config.rms_threshold**2
+
+        # Everything welch() would rebuild on each call depends only on the
+        # segment length, sample rate and band, so it is computed once per
+        # length: in practice just the full-size segment.
+        self._plans: Dict[int, _WelchPlan] = {}
+        self._plan(_NPERSEG)
 
     def score_bark(self, samples: np.ndarray) -> float:
         """Return a heuristic bark score in the range [0, 1]."""
@@ -37,20 +62,17 @@ class HeuristicBarkDetector:
     def is_positive(self, metrics: Dict[str, float]) -> bool:
         """Determine if heuristics satisfy threshold conditions."""
         return bool(
-            metrics["rms"] >= self.config.rms_threshold
+            metrics["mean_square"] >= self._rms_threshold_sq
             and metrics["band_energy"] >= self.config.band_energy_min
         )
 
     def _compute(self, samples: np.ndarray) -> Tuple[float, Dict[str, float]]:
-        samples = samples.astype(np.float32, copy=False)
-        rms = float(np.sqrt(np.mean(np.square(samples))))
+        # dot() reduces in one BLAS pass with no squared temporary.
+        mean_square = float(np.dot(samples, samples)) / samples.size if samples.size else 0.0
+        # The score's rms_ratio is linear in RMS, so this one sqrt remains.
+        rms = math.sqrt(mean_square)
 
-        freqs, psd = welch(samples, fs=self.sample_rate, nperseg=1024)
-        band_mask = (freqs >= self.config.band_low_hz) & (freqs <= self.config.band_high_hz)
-        if not np.any(band_mask):
-            band_energy = 0.0
-        else:
-            band_energy = float(np.trapz(psd[band_mask], freqs[band_mask]))
+        band_energy = self._band_energy(samples)
 
         rms_ratio = np.clip(
             (rms - self.config.rms_threshold) / max(self.config.rms_threshold, 1e-8) + 0.5,
@@ -66,9 +88,74 @@ class HeuristicBarkDetector:
 
         metrics = {
             "rms": rms,
+            "mean_square": mean_square,
             "band_energy": band_energy,
             "rms_ratio": rms_ratio,
             "band_ratio": band_ratio,
         }
         self.last_metrics = metrics
         return score, metrics
+
+    def _plan(self, nperseg: int) -> _WelchPlan:
+        plan = self._plans.get(nperseg)
+        if plan is None:
+            plan = self._plans[nperseg] = self._build_plan(nperseg)
+        return plan
+
+    def _build_plan(self, nperseg: int) -> _WelchPlan:
+        sample_rate = self.sample_rate
+        window = get_window("hann", nperseg).astype(np.float32)
+        scale = 1.0 / (sample_rate * float(np.sum(window**2)))
+        # One-sided density: every bin but DC (and Nyquist, which only an even
+        # length has) carries both halves of the spectrum.
+        bins = nperseg // 2 + 1
+        psd_scale = np.full(bins, 2.0 * scale)
+        psd_scale[0] = scale
+        if nperseg % 2 == 0:
+            psd_scale[-1] = scale
+
+        # Bin k sits at k * sample_rate / nperseg Hz; the band is inclusive.
+        lo = max(0, math.ceil(self.config.band_low_hz * nperseg / sample_rate))
+        hi = min(bins, math.floor(self.config.band_high_hz * nperseg / sample_rate) + 1)
+        if hi <= lo:
+            return _WelchPlan(window, slice(0, 0), np.zeros(0), None)
+
+        # The band is a contiguous run of bins, so integrating its PSD with the
+        # trapezoid rule is a dot product with fixed weights: half-weight
+        # endpoints times the bin spacing, with the density scale folded in.
+        weights = np.full(hi - lo, sample_rate / nperseg)
+        weights[0] *= 0.5
+        weights[-1] *= 0.5
+        if hi - lo == 1:
+            weights[0] = 0.0
+        # A periodic Hann window's spectrum is zero past bin 1, so for any
+        # band clear of DC the detrend cannot change the result.
+        window_spectrum = sp_fft.rfft(window)
+        window_band: Optional[np.ndarray] = window_spectrum[lo:hi]
+        if np.max(np.abs(window_band)) <= 1e-6 * abs(window_spectrum[0]):
+            window_band = None
+        return _WelchPlan(window, slice(lo, hi), weights * psd_scale[lo:hi], window_band)
+
+    def _band_energy(self, samples: np.ndarray) -> float:
+        """Integrate the Welch PSD over the configured band."""
+        if not samples.size:
+            return 0.0
+        # Like welch(), an input shorter than a segment becomes one segment.
+        nperseg = min(samples.size, _NPERSEG)
+        plan = self._plan(nperseg)
+        if not plan.band_weights.size:
+            return 0.0
+
+        segments = sliding_window_view(samples, nperseg)[:: max(1, nperseg // 2)]
+        # scipy's pocketfft keeps float32 input in complex64, half the traffic
+        # of numpy's always-double transform, and can split the segments
+        # across threads.
+        band = sp_fft.rfft(segments * plan.window, axis=1, workers=-1)[:, plan.band_bins]
+        # Welch removes each segment's mean before windowing. The FFT is
+        # linear, so that is the same as subtracting mean * FFT(window) over
+        # the band afterwards -- no detrended copy of every segment, and
+        # nothing at all when the window does not reach the band.
+        if plan.window_band is not None:
+            band -= segments.mean(axis=1, keepdims=True) * plan.window_band
+        power = band.real**2 + band.imag**2
+        return float(np.dot(power.sum(axis=0), plan.band_weights)) / len(segments)
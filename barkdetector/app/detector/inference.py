@@ -0,0 +1,112 @@
+"""Background inference so model latency does not stall the audio loop."""
+
+from __future__ import annotations
+
+import threading
+from collections import deque
+from typing import Any, Deque, List, Optional, Tuple
+
+import numpy as np
+from loguru import logger
+
+
+class InferenceWorker:
+    """Runs a detector's ``score_bark`` on its own thread.
+
+    Windows are copied into a small pool of preallocated slots. Every slot is
+    owned by exactly one of the free list, the pending queue or the worker, so
+    the caller never overwrites audio that is being scored. When the worker
+    falls behind, the oldest pending window is dropped rather than blocking the
+    caller. Both sides only ever append/popleft on deques, which are atomic, so
+    no lock is held around a window.
+    """
+
+    def __init__(self, detector: Any, window_samples: int, depth: int = 2) -> None:
+        self._detector = detector
+        # ``depth`` windows may wait while one more is being scored.
+        self._slots = np.zeros((depth + 1, window_samples), dtype=np.float32)
+        self._free: Deque[int] = deque(range(depth + 1))
+        # A slot of None is a window the caller chose not to score.
+        self._pending: Deque[Tuple[Optional[int], int, Any]] = deque()
+        self._results: Deque[Tuple[Any, float, Optional[Exception]]] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.dropped = 0
+
+    def start(self) -> None:
+        """Start the inference thread."""
+        self._thread = threading.Thread(target=self._run, daemon=True, name="inference")
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the inference thread; pending windows are discarded."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def submit(self, window: Optional[np.ndarray], context: Any) -> None:
+        """Queue ``window`` for scoring; ``context`` comes back with its result.
+
+        A window of None scores 0.0 without running the model. It still
+        queues behind the windows before it, so results stay in order.
+        """
+        if window is None:
+            self._pending.append((None, 0, context))
+            self._wake.set()
+            return
+
+        slot = self._take_slot()
+        if slot is None:  # pragma: no cover - every slot is in flight
+            return
+        size = min(window.shape[0], self._slots.shape[1])
+        self._slots[slot, :size] = window[:size]
+        self._pending.append((slot, size, context))
+        self._wake.set()
+
+    def _take_slot(self) -> Optional[int]:
+        try:
+            return self._free.popleft()
+        except IndexError:
+            pass
+        while True:
+            try:
+                slot, _size, _context = self._pending.popleft()
+            except IndexError:
+                return None
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                logger.warning(
+                    "Inference is not keeping up with the audio; dropped {} window(s) so far",
+                    self.dropped,
+                )
+            if slot is not None:
+                return slot
+
+    def drain(self) -> List[Tuple[Any, float, Optional[Exception]]]:
+        """Return the ``(context, score, error)`` of every window scored so far."""
+        results = []
+        while self._results:
+            results.append(self._results.popleft())
+        return results
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(timeout=0.5)
+            self._wake.clear()
+            while not self._stop.is_set():
+                try:
+                    slot, size, context = self._pending.popleft()
+                except IndexError:
+                    break
+                if slot is None:
+                    self._results.append((context, 0.0, None))
+                    continue
+                try:
+                    score = float(self._detector.score_bark(self._slots[slot, :size]))
+                    error = None
+                except Exception as exc:  # pragma: no cover - model dependent
+                    score, error = 0.0, exc
+                self._results.append((context, score, error))
+                self._free.append(slot)
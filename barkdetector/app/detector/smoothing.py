@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
+import math
 import time
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Deque
+from typing import List
 
 
 @dataclass
@@ -20,14 +20,26 @@ class EventSmoother:
     """Implements majority vote with cooldown."""
 
     config: SmootherConfig
-    _history: Deque[bool] = field(default_factory=deque)
-    _scores: Deque[float] = field(default_factory=deque)
-    _last_trigger_ts: float = 0.0
+    # Circular vote history with a running positive count, so an update is a
+    # few integer operations however large the window.
+    _history: bytearray = field(init=False, repr=False)
+    _scores: List[float] = field(init=False, repr=False)
+    _index: int = field(init=False, default=0)
+    _count: int = field(init=False, default=0)
+    _positives: int = field(init=False, default=0)
+    # -inf rather than 0 so a monotonic clock that started less than a
+    # cooldown ago (a fresh boot) does not suppress the first event.
+    _last_trigger_ts: float = -math.inf
     #: Strongest score across the windows that produced the last trigger. The
     #: score of the final window alone is misleading -- a vote can be carried by
     #: earlier windows, so the triggering window sometimes reads 0.0.
     last_peak_score: float = 0.0
 
+    def __post_init__(self) -> None:
+        size = max(1, self.config.window_count)
+        self._history = bytearray(size)
+        self._scores = [0.0] * size
+
     def update(
         self,
         is_positive: bool,
@@ -42,27 +54,35 @@ class EventSmoother:
         ts = timestamp if timestamp is not None else time.time()
         cfg = self.config
 
-        if len(self._history) == cfg.window_count:
-            self._history.popleft()
-            self._scores.popleft()
-        self._history.append(is_positive)
-        self._scores.append(float(score))
+        idx = self._index
+        vote = 1 if is_positive else 0
+        self._positives += vote - self._history[idx]
+        self._history[idx] = vote
+        self._scores[idx] = float(score)
+        self._index = (idx + 1) % len(self._history)
+        self._count = min(self._count + 1, len(self._history))
 
-        positives = sum(1 for flag in self._history if flag)
-        enough_votes = positives >= cfg.positives_required
+        enough_votes = self._positives >= cfg.positives_required
         cooldown_active = (ts - self._last_trigger_ts) < cfg.cooldown_seconds
 
         if enough_votes and not cooldown_active:
             self._last_trigger_ts = ts
-            self.last_peak_score = max(self._scores) if self._scores else 0.0
-            self._history.clear()
-            self._scores.clear()
+            # Until the ring first wraps only the leading slots hold votes.
+            self.last_peak_score = max(self._scores[: self._count])
+            self._clear_history()
             return True
         return False
 
     def reset(self) -> None:
         """Clear history and cooldown."""
-        self._history.clear()
-        self._scores.clear()
-        self._last_trigger_ts = 0.0
+        self._clear_history()
+        self._last_trigger_ts = -math.inf
         self.last_peak_score = 0.0
+
+    def _clear_history(self) -> None:
+        size = len(self._history)
+        self._history[:] = bytes(size)
+        self._scores[:] = [0.0] * size
+        self._index = 0
+        self._count = 0
+        self._positives = 0
@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import csv
+import functools
+import hashlib
 import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, Iterator, List
 
 import numpy as np
 import requests
@@ -24,6 +26,18 @@ except ImportError:  # pragma: no cover - depends on the installed runtime
     except ImportError:
         Interpreter = None  # type: ignore[assignment]
 
+# YAMNet classifies 0.975 s patches (15600 samples at 16 kHz) that start every
+# 0.48 s. The interpreter is sized for exactly one patch, once, since resizing
+# reallocates its whole tensor arena.
+_PATCH_SAMPLES = 15600
+_PATCH_HOP = 7680
+
+
+def _download_cache_dir() -> Path:
+    """Per-user cache for downloaded model files, shared by every checkout."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "barkdetector"
+
 
 class YAMNetInitializationError(Exception):
     """Raised when the YAMNet detector cannot be initialised."""
@@ -35,6 +49,13 @@ class YAMNetConfig:
     classes_url: str
     conf_threshold: float
     label_substrings: Iterable[str]
+    # Use a post-training int8-quantised model instead of the float one. There
+    # is no canonical hosted int8 YAMNet, so the URL must be supplied.
+    quantized: bool = False
+    quantized_model_url: str = ""
+    # 0 picks half the cores: invoke() parallelises well, but the audio and
+    # main threads still need a core.
+    num_threads: int = 0
 
 
 class YAMNetBarkDetector:
@@ -44,6 +65,15 @@ class YAMNetBarkDetector:
         self.config = config
         self.models_dir = models_dir or Path(__file__).resolve().parents[1] / "models"
         self.model_path = self.models_dir / "yamnet.tflite"
+        self.model_url = config.model_url
+        if config.quantized:
+            if config.quantized_model_url:
+                self.model_path = self.models_dir / "yamnet_int8.tflite"
+                self.model_url = config.quantized_model_url
+            else:
+                logger.warning(
+                    "YAMNet 'quantized' is set without a quantized_model_url; using the float model"
+                )
         self.classes_path = self.models_dir / "yamnet_class_map.csv"
         if Interpreter is None:
             raise YAMNetInitializationError(
@@ -52,10 +82,20 @@ class YAMNetBarkDetector:
             )
 
         self._interpreter: Interpreter | None = None
-        self._bark_indices: List[int] = []
+        self._bark_indices = np.zeros(0, dtype=np.int32)
+        # Set when exactly one class matches; a plain column slice then
+        # replaces the gather.
+        self._bark_index: int | None = None
         self._input_index: int | None = None
         self._output_index: int | None = None
-        self._current_input_length: int | None = None
+        self._input_buf = np.zeros(_PATCH_SAMPLES, dtype=np.float32)
+        # Set by _load_interpreter when the model's input/output are integer
+        # tensors; None means the float path.
+        self._input_quant: tuple[float, int] | None = None
+        self._output_quant: tuple[float, int] | None = None
+        self._quant_buf: np.ndarray | None = None
+        #: Display names of every class, indexed like the model's outputs.
+        self.class_names: List[str] = []
 
         try:
             self._prepare_files()
@@ -69,34 +109,111 @@ class YAMNetBarkDetector:
         if self._interpreter is None or self._input_index is None or self._output_index is None:
             raise RuntimeError("YAMNet interpreter is not initialised")
 
-        waveform = samples.astype(np.float32, copy=False)
-        if waveform.ndim != 1:
-            waveform = waveform.squeeze()
+        # Copying into the float32 input buffer casts, so any dtype is fine.
+        waveform = samples if samples.ndim == 1 else samples.squeeze()
+        if waveform.shape[0] == 0 or not self._bark_indices.size:
+            return 0.0
 
-        if self._current_input_length != waveform.shape[0]:
-            self._resize_input(len(waveform))
+        score = 0.0
+        for patch in self._patches(waveform):
+            score = max(score, self._score_patch(patch))
+        return score
 
-        self._interpreter.set_tensor(self._input_index, waveform)
-        self._interpreter.invoke()
-        predictions = self._interpreter.get_tensor(self._output_index)
+    def predict(self, samples: np.ndarray) -> np.ndarray:
+        """Return every class score, one row per patch, for inspection."""
+        if self._interpreter is None or self._input_index is None or self._output_index is None:
+            raise RuntimeError("YAMNet interpreter is not initialised")
+        waveform = samples if samples.ndim == 1 else samples.squeeze()
+        rows = []
+        if waveform.shape[0]:
+            for patch in self._patches(waveform):
+                predictions = self._invoke(patch).astype(np.float32)
+                if self._output_quant is not None:
+                    scale, zero_point = self._output_quant
+                    predictions = (predictions - zero_point) * scale
+                rows.append(predictions)
+        if not rows:
+            return np.zeros((0, len(self.class_names)), dtype=np.float32)
+        return np.concatenate(rows, axis=0)
+
+    # Internal helpers -------------------------------------------------
 
-        if not self._bark_indices:
+    def _patches(self, waveform: np.ndarray) -> Iterator[np.ndarray]:
+        # Same patching YAMNet applies to a waveform: a patch every hop, the
+        # last one zero-padded to full length by _invoke(). An input shorter
+        # than a patch is one zero-padded patch, as the model itself would pad
+        # it. Callers' windows overlap, so splicing them into a rolling history
+        # would feed the model audio that never happened.
+        n = waveform.shape[0]
+        patches = 1 + max(0, -(-(n - _PATCH_SAMPLES) // _PATCH_HOP))
+        for k in range(patches):
+            start = k * _PATCH_HOP
+            yield waveform[start : start + _PATCH_SAMPLES]
+
+    def _score_patch(self, patch: np.ndarray) -> float:
+        predictions = self._invoke(patch)
+        if not predictions.size:
             return 0.0
 
-        bark_probs = predictions[:, self._bark_indices]
-        score = float(np.max(bark_probs)) if bark_probs.size else 0.0
+        if self._bark_index is not None:
+            score = float(predictions[:, self._bark_index].max())
+        else:
+            score = float(predictions.take(self._bark_indices, axis=1).max())
+        if self._output_quant is not None:
+            # Dequantisation is monotonic, so only the winning value needs it.
+            scale, zero_point = self._output_quant
+            score = (score - zero_point) * scale
         return float(np.clip(score, 0.0, 1.0))
 
-    # Internal helpers -------------------------------------------------
+    def _invoke(self, patch: np.ndarray) -> np.ndarray:
+        buf = self._input_buf
+        size = patch.shape[0]
+        buf[:size] = patch
+        buf[size:] = 0.0
+
+        if self._input_quant is not None and self._quant_buf is not None:
+            # q = round(x / scale + zero_point), saturated, computed in place in
+            # the float buffer before the single cast into the int buffer.
+            scale, zero_point = self._input_quant
+            info = np.iinfo(self._quant_buf.dtype)
+            np.divide(buf, scale, out=buf)
+            np.add(buf, zero_point, out=buf)
+            np.rint(buf, out=buf)
+            np.clip(buf, info.min, info.max, out=buf)
+            self._quant_buf[:] = buf
+            self._interpreter.set_tensor(self._input_index, self._quant_buf)
+        else:
+            self._interpreter.set_tensor(self._input_index, buf)
+        self._interpreter.invoke()
+        return self._interpreter.get_tensor(self._output_index)
 
     def _prepare_files(self) -> None:
-        os.makedirs(self.models_dir, exist_ok=True)
-        if not self.model_path.exists():
-            logger.info("Downloading YAMNet model from {}", self.config.model_url)
-            self._download_file(self.config.model_url, self.model_path)
-        if not self.classes_path.exists():
-            logger.info("Downloading YAMNet class map from {}", self.config.classes_url)
-            self._download_file(self.config.classes_url, self.classes_path)
+        self.model_path = self._fetch(self.model_url, self.model_path, "YAMNet model")
+        self.classes_path = self._fetch(
+            self.config.classes_url, self.classes_path, "YAMNet class map"
+        )
+
+    def _fetch(self, url: str, bundled: Path, what: str) -> Path:
+        """Return a local copy of ``url``, downloading it at most once.
+
+        A file already in the models directory wins. Otherwise the download is
+        kept in the user cache under a hash of its URL, so a different URL is
+        never mistaken for a cached one.
+        """
+        if bundled.exists():
+            return bundled
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        target = _download_cache_dir() / f"{digest}-{bundled.name}"
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            logger.warning("Download cache unavailable ({}); using {}", exc, self.models_dir)
+            os.makedirs(self.models_dir, exist_ok=True)
+            target = bundled
+        if not target.exists():
+            logger.info("Downloading {} from {}", what, url)
+            self._download_file(url, target)
+        return target
 
     def _download_file(self, url: str, destination: Path) -> None:
         response = requests.get(url, stream=True, timeout=30)
@@ -110,20 +227,44 @@ class YAMNetBarkDetector:
         tmp_path.replace(destination)
 
     def _load_interpreter(self) -> None:
-        self._interpreter = Interpreter(model_path=str(self.model_path))
+        # Recent runtimes apply XNNPACK to float models by default; only the
+        # thread count needs setting.
+        self._interpreter = Interpreter(
+            model_path=str(self.model_path), num_threads=self._num_threads()
+        )
         self._interpreter.allocate_tensors()
         input_details = self._interpreter.get_input_details()[0]
         output_details = self._interpreter.get_output_details()[0]
         self._input_index = int(input_details["index"])
         self._output_index = int(output_details["index"])
-        self._current_input_length = input_details["shape"][0] or None
+        self._resize_input(_PATCH_SAMPLES)
+        self._input_quant = self._quantization(input_details)
+        self._output_quant = self._quantization(output_details)
+        if self._input_quant is not None:
+            self._quant_buf = np.zeros(_PATCH_SAMPLES, dtype=input_details["dtype"])
+        if self._input_quant or self._output_quant:
+            logger.info("YAMNet model is quantized; using the integer input/output path")
+
+    def _num_threads(self) -> int:
+        if self.config.num_threads > 0:
+            return self.config.num_threads
+        return max(1, (os.cpu_count() or 1) // 2)
+
+    @staticmethod
+    def _quantization(details: dict) -> tuple[float, int] | None:
+        """Return (scale, zero_point) for an integer tensor, None for float."""
+        if not np.issubdtype(details["dtype"], np.integer):
+            return None
+        scale, zero_point = details.get("quantization", (0.0, 0))
+        if not scale:
+            return None
+        return float(scale), int(zero_point)
 
     def _resize_input(self, length: int) -> None:
         if self._interpreter is None or self._input_index is None:
             raise RuntimeError("Interpreter not prepared")
         self._interpreter.resize_tensor_input(self._input_index, [length], strict=False)
         self._interpreter.allocate_tensors()
-        self._current_input_length = length
 
     def _load_class_map(self) -> None:
         substrings = [s.lower() for s in self.config.label_substrings]
@@ -133,6 +274,7 @@ class YAMNetBarkDetector:
 
         if not labels:
             raise RuntimeError("YAMNet class map is empty")
+        self.class_names = labels
 
         bark_indices: List[int] = []
         for idx, label in enumerate(labels):
@@ -145,4 +287,29 @@ class YAMNetBarkDetector:
                 "No YAMNet classes matched substrings {}; bark detection will always be zero",
                 substrings,
             )
-        self._bark_indices = bark_indices
+        # An index array built once; a list would be converted on every hop.
+        self._bark_indices = np.asarray(bark_indices, dtype=np.int32)
+        self._bark_index = bark_indices[0] if len(bark_indices) == 1 else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_yamnet(
+    model_url: str,
+    classes_url: str,
+    conf_threshold: float,
+    label_substrings: tuple[str, ...] = ("dog", "bark", "bow", "yip"),
+) -> YAMNetBarkDetector:
+    """Return one shared detector per configuration.
+
+    Loading the interpreter is the slow part of start-up, so callers asking
+    for the same model get the same instance. Scoring holds no state
+    between calls, but the instance is not thread-safe.
+    """
+    return YAMNetBarkDetector(
+        YAMNetConfig(
+            model_url=model_url,
+            classes_url=classes_url,
+            conf_threshold=conf_threshold,
+            label_substrings=label_substrings,
+        )
+    )
@@ -3,20 +3,24 @@
 from __future__ import annotations
 
 import argparse
+import math
 import os
+import queue
 import sys
+import threading
 import time
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 import requests
 import yaml
 from loguru import logger
 
-from detector.audio import AudioStreamConfig, AudioStreamProvider
+from detector.audio import AudioStreamConfig, AudioStreamProvider, WindowBuffer
 from detector.capture import AudioCaptureManager, CaptureConfig
 from detector.heuristic import HeuristicBarkDetector, HeuristicConfig
+from detector.inference import InferenceWorker
 from detector.smoothing import EventSmoother, SmootherConfig
 from detector.yamnet import (
     YAMNetBarkDetector,
@@ -24,6 +28,7 @@ from detector.yamnet import (
     YAMNetInitializationError,
 )
 from mqtt.mqtt_client import MQTTConfig, MQTTPublisher
+from queues import put_drop_oldest
 
 
 def parse_args() -> argparse.Namespace:
@@ -71,7 +76,8 @@ def load_config(path: Path) -> Dict[str, Any]:
     return config
 
 
-def setup_logging(log_config: Dict[str, Any]) -> None:
+def setup_logging(log_config: Dict[str, Any]) -> bool:
+    """Configure the sinks; return whether DEBUG messages reach them."""
     level = log_config.get("level", "INFO")
     logger.remove()
     logger.add(sys.stderr, level=level)
@@ -94,6 +100,8 @@ def setup_logging(log_config: Dict[str, Any]) -> None:
             file_path,
             exc,
         )
+    level_no = logger.level(level.upper()).no if isinstance(level, str) else int(level)
+    return level_no <= logger.level("DEBUG").no
 
 
 def list_devices() -> None:
@@ -144,6 +152,9 @@ def build_detectors(config: Dict[str, Any], sample_rate: int) -> tuple[Any, str,
                         "label_substrings",
                         ("dog", "bark", "bow", "yip"),
                     ),
+                    quantized=bool(yamnet_cfg.get("quantized", False)),
+                    quantized_model_url=yamnet_cfg.get("quantized_model_url", "") or "",
+                    num_threads=int(yamnet_cfg.get("num_threads", 0) or 0),
                 )
             )
             active_name = "yamnet"
@@ -179,7 +190,7 @@ def normalize_window(
     if gain <= 1.0:
         return window, 1.0
 
-    return np.clip(window * gain, -1.0, 1.0).astype(np.float32, copy=False), gain
+    return np.clip(window * gain, -1.0, 1.0), gain
 
 
 def configure_capture(config: Dict[str, Any], sample_rate: int) -> AudioCaptureManager:
@@ -254,6 +265,44 @@ def send_dailybot_event(
         logger.warning("Failed to send bark event to DailyBot: {}", exc)
 
 
+class DailyBotNotifier:
+    """Posts events to DailyBot from a background thread.
+
+    The POST can take up to its full timeout; made inline it would stall the
+    audio loop for that long on every event. As with MQTT, the oldest event is
+    dropped if the queue fills. None is the shutdown sentinel.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self._queue: "queue.Queue[Optional[Tuple[Dict[str, Any], Optional[Path]]]]" = queue.Queue(
+            maxsize=32
+        )
+        self._thread = threading.Thread(target=self._run, daemon=True, name="dailybot")
+        self._thread.start()
+
+    def notify(self, payload: Dict[str, Any], capture_path: Optional[Path]) -> None:
+        """Queue an event without blocking."""
+        if put_drop_oldest(self._queue, (payload, capture_path)):
+            logger.warning("DailyBot queue full; dropped the oldest event")
+
+    def stop(self) -> None:
+        """Send what is queued, then stop the thread."""
+        try:
+            self._queue.put(None, timeout=1.0)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=10.0)
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            payload, capture_path = item
+            send_dailybot_event(payload, capture_path, self.url)
+
+
 def main() -> None:
     args = parse_args()
     config_path = Path(args.config)
@@ -263,7 +312,7 @@ def main() -> None:
         return
 
     config = load_config(config_path)
-    setup_logging(config.get("logging", {}))
+    log_windows = setup_logging(config.get("logging", {}))
     device_id = config.get("device_id", "linux-mic-01")
 
     audio_cfg = config.get("audio", {})
@@ -303,6 +352,7 @@ def main() -> None:
             dailybot_enabled = False
         else:
             logger.info("DailyBot integration enabled")
+    dailybot = DailyBotNotifier(dailybot_url) if dailybot_enabled else None
 
     smoother_cfg = config.get("smoothing", {})
     smoother = EventSmoother(
@@ -334,91 +384,171 @@ def main() -> None:
 
     window_samples = int(round(window_seconds * sample_rate))
     hop_samples = int(round(hop_seconds * sample_rate))
-    buffer = np.zeros(0, dtype=np.float32)
+    # The provider always yields hop-sized chunks.
+    window_buffer = WindowBuffer(window_samples, hop_samples, hop_samples)
+
+    # YAMNet is scored on its own thread so a slow invoke() never holds up
+    # reading the stream; the heuristic is cheap enough to stay inline.
+    inference: Optional[InferenceWorker] = None
+    # Windows quieter than this RMS are scored 0 without running YAMNet. It is
+    # compared before normalisation, against what the microphone really heard.
+    # Only meaningful with a model to skip, so the heuristic never pays for it.
+    gate_mean_square = 0.0
+    if detector_name == "yamnet":
+        inference = InferenceWorker(detector, window_samples)
+        inference.start()
+        gate_rms = float(
+            config.get("detection", {}).get("yamnet", {}).get("gate_rms", 0.0) or 0.0
+        )
+        if gate_rms > 0:
+            gate_mean_square = gate_rms * gate_rms
+            logger.info("YAMNet silence gate enabled (rms < {} is not scored)", gate_rms)
+
+    # Copied per event rather than rebuilt: the publish queue keeps a
+    # reference to each payload, so one dict cannot be reused in place.
+    base_payload = {
+        "event": "dog_bark",
+        "score": 0.0,
+        "ts": 0,
+        "device_id": device_id,
+        "detector": detector_name,
+    }
+
+    def handle_decision(
+        score: float,
+        positive: bool,
+        timestamp: float,
+        position: int,
+        rms: float,
+        peak: float,
+        gain_applied: float,
+    ) -> None:
+        triggered = smoother.update(positive, timestamp, score)
+        # rms/peak make a dead microphone obvious: PortAudio can open a
+        # silent device and look perfectly healthy while scoring zeros.
+        # Checked up front because loguru still builds the record for a
+        # message no sink wants, and this one fires twice a second.
+        if log_windows:
+            logger.debug(
+                "Window score {:.3f} positive={} detector={} rms={:.5f} peak={:.5f} gain={:.1f}x",
+                score,
+                positive,
+                detector_name,
+                rms,
+                peak,
+                gain_applied,
+            )
+
+        if triggered:
+            # The vote can be carried by earlier windows, so the final
+            # window's score understates the event -- report the peak.
+            event_score = smoother.last_peak_score
+            # ``timestamp`` is monotonic, which only orders windows; captures
+            # and payloads need wall-clock time.
+            event_ts = time.time()
+            # Anchored at the deciding window, which under YAMNet is a hop
+            # or so behind the stream by the time its score comes back.
+            capture_path = capture_manager.schedule_capture(
+                event_ts, device_id, event_score, position
+            )
+            payload = dict(base_payload)
+            payload["score"] = round(event_score, 4)
+            payload["ts"] = int(event_ts)
+            payload["detector"] = detector_name
+            logger.info(
+                "Bark event triggered score={:.3f} detector={} capture={}",
+                event_score,
+                detector_name,
+                capture_path,
+            )
+            if mqtt_publisher:
+                mqtt_publisher.publish(payload)
+            # Send to DailyBot API if enabled and URL is configured
+            if dailybot:
+                dailybot.notify(payload, capture_path)
 
     try:
         for chunk in audio_provider.stream_chunks():
-            timestamp = time.time()
+            # Monotonic: the cooldown must not jump when NTP steps the clock.
+            timestamp = time.monotonic()
             completed_paths = capture_manager.extend(chunk)
             for path in completed_paths:
                 logger.info("Capture finalised at {}", path)
+            # Every chunk is one hop, so a window always ends with this one.
+            position = capture_manager.position
+
+            window_buffer.push(chunk)
+            for window in window_buffer.windows():
+                # These only feed the gate and the per-window debug line, so
+                # they are skipped when neither is on. dot() is one BLAS pass
+                # with no squared temporary.
+                mean_square = rms = peak = 0.0
+                if window.size and (log_windows or gate_mean_square > 0):
+                    mean_square = float(np.dot(window, window)) / window.size
+                    rms = math.sqrt(mean_square)
+                if window.size and log_windows:
+                    peak = float(np.max(np.abs(window)))
+
+                if inference is not None:
+                    if mean_square < gate_mean_square:
+                        # Queued rather than decided here, so it stays in
+                        # order behind the windows still being scored.
+                        inference.submit(None, (timestamp, position, rms, peak, 1.0))
+                        continue
+                    scored_window = window
+                    gain_applied = 1.0
+                    if normalize_cfg["enabled"]:
+                        scored_window, gain_applied = normalize_window(
+                            window,
+                            normalize_cfg["target_peak"],
+                            normalize_cfg["noise_floor"],
+                            normalize_cfg["max_gain"],
+                        )
+                    inference.submit(
+                        scored_window, (timestamp, position, rms, peak, gain_applied)
+                    )
+                    continue
 
-            buffer = np.concatenate([buffer, chunk])
-            while buffer.size >= window_samples:
-                window = buffer[:window_samples]
-                buffer = buffer[hop_samples:]
-
-                gain_applied = 1.0
                 try:
-                    if detector_name == "yamnet":
-                        scored_window = window
-                        if normalize_cfg["enabled"]:
-                            scored_window, gain_applied = normalize_window(
-                                window,
-                                normalize_cfg["target_peak"],
-                                normalize_cfg["noise_floor"],
-                                normalize_cfg["max_gain"],
-                            )
-                        score = float(detector.score_bark(scored_window))
-                        positive = score >= yamnet_threshold
-                    else:
-                        score, metrics = heuristic_detector.evaluate(window)
-                        positive = heuristic_detector.is_positive(metrics)
+                    score, metrics = heuristic_detector.evaluate(window)
+                    positive = heuristic_detector.is_positive(metrics)
                 except Exception as exc:  # pragma: no cover - runtime safeguard
                     logger.error("Detector error ({}): {}", detector_name, exc)
-                    if detector_name == "yamnet":
-                        logger.warning("Switching to heuristic detector due to errors")
-                        detector = heuristic_detector
-                        detector_name = "heuristic"
-                        continue
-                    else:
-                        continue
-
-                triggered = smoother.update(positive, timestamp, score)
-                # rms/peak make a dead microphone obvious: PortAudio can open a
-                # silent device and look perfectly healthy while scoring zeros.
-                logger.debug(
-                    "Window score {:.3f} positive={} detector={} rms={:.5f} peak={:.5f} gain={:.1f}x",
+                    continue
+                handle_decision(score, positive, timestamp, position, rms, peak, 1.0)
+
+            if inference is None:
+                continue
+            for context, score, error in inference.drain():
+                if error is not None:  # pragma: no cover - runtime safeguard
+                    logger.error("Detector error ({}): {}", detector_name, error)
+                    logger.warning("Switching to heuristic detector due to errors")
+                    inference.stop()
+                    inference = None
+                    gate_mean_square = 0.0
+                    detector_name = "heuristic"
+                    break
+                window_ts, window_pos, rms, peak, gain_applied = context
+                handle_decision(
                     score,
-                    positive,
-                    detector_name,
-                    float(np.sqrt(np.mean(np.square(window)))),
-                    float(np.max(np.abs(window))) if window.size else 0.0,
+                    score >= yamnet_threshold,
+                    window_ts,
+                    window_pos,
+                    rms,
+                    peak,
                     gain_applied,
                 )
-
-                if triggered:
-                    # The vote can be carried by earlier windows, so the final
-                    # window's score understates the event -- report the peak.
-                    event_score = smoother.last_peak_score
-                    capture_path = capture_manager.schedule_capture(
-                        timestamp, device_id, event_score
-                    )
-                    payload = {
-                        "event": "dog_bark",
-                        "score": float(round(event_score, 4)),
-                        "ts": int(timestamp),
-                        "device_id": device_id,
-                        "detector": detector_name,
-                    }
-                    logger.info(
-                        "Bark event triggered score={:.3f} detector={} capture={}",
-                        event_score,
-                        detector_name,
-                        capture_path,
-                    )
-                    if mqtt_publisher:
-                        mqtt_publisher.publish(payload)
-                    # Send to DailyBot API if enabled and URL is configured
-                    if dailybot_enabled:
-                        send_dailybot_event(payload, capture_path, dailybot_url)
     except KeyboardInterrupt:
         logger.info("Interrupted by user, shutting down")
     finally:
-        capture_manager.stop_cleanup()
+        if inference is not None:
+            inference.stop()
+        capture_manager.stop()
         audio_provider.stop()
         if mqtt_publisher:
             mqtt_publisher.stop()
+        if dailybot:
+            dailybot.stop()
 
 
 if __name__ == "__main__":
@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 import json
+import queue
 import threading
 import time
 import uuid
 from dataclasses import dataclass
-from typing import Optional
+from typing import Optional, Tuple
 
 from loguru import logger
 from paho.mqtt import client as mqtt
 
+from queues import put_drop_oldest
+
 
 @dataclass
 class MQTTConfig:
@@ -42,6 +45,11 @@ class MQTTPublisher:
         self.client.on_disconnect = self._on_disconnect
         self._connected = threading.Event()
         self.client.reconnect_delay_set(min_delay=1, max_delay=30)
+        # publish() only enqueues; serialisation and the wait for a connection
+        # happen on the publisher thread, off the detection loop. None is the
+        # shutdown sentinel.
+        self._pub_q: "queue.Queue[Optional[Tuple[dict, int, bool]]]" = queue.Queue(maxsize=256)
+        self._publish_thread: Optional[threading.Thread] = None
 
     def start(self) -> None:
         """Connect to the broker and start the network loop."""
@@ -50,9 +58,19 @@ class MQTTPublisher:
         except Exception as exc:  # pragma: no cover - network dependent
             logger.error("Initial MQTT connection failed: {}", exc)
         self.client.loop_start()
+        self._publish_thread = threading.Thread(
+            target=self._publish_loop, daemon=True, name="mqtt-publish"
+        )
+        self._publish_thread.start()
 
     def stop(self) -> None:
-        """Stop the loop and disconnect."""
+        """Flush queued events, stop the loop and disconnect."""
+        if self._publish_thread is not None:
+            try:
+                self._pub_q.put(None, timeout=1.0)
+            except queue.Full:
+                pass
+            self._publish_thread.join(timeout=5.0)
         self.client.loop_stop()
         try:
             self.client.disconnect()
@@ -60,8 +78,23 @@ class MQTTPublisher:
             pass
 
     def publish(self, payload: dict, qos: int = 1, retain: bool = False) -> None:
-        """Publish a JSON payload to the configured topic."""
-        data = json.dumps(payload)
+        """Queue a JSON payload for the configured topic without blocking."""
+        if put_drop_oldest(self._pub_q, (payload, qos, retain)):
+            logger.warning("MQTT publish queue full; dropped the oldest event")
+
+    def _publish_loop(self) -> None:
+        while True:
+            item = self._pub_q.get()
+            if item is None:
+                return
+            payload, qos, retain = item
+            try:
+                self._send(payload, qos, retain)
+            except Exception as exc:  # pragma: no cover - network dependent
+                logger.error("MQTT publish failed: {}", exc)
+
+    def _send(self, payload: dict, qos: int, retain: bool) -> None:
+        data = json.dumps(payload, separators=(",", ":"))
         if not self._connected.wait(timeout=2.0):
             logger.warning("MQTT client not connected; attempting publish anyway")
         result = self.client.publish(self.config.topic, data, qos=qos, retain=retain)
@@ -0,0 +1,28 @@
+"""Bounded hand-off queues for the outbound IO threads."""
+
+from __future__ import annotations
+
+import queue
+from typing import Any
+
+
+def put_drop_oldest(q: "queue.Queue[Any]", item: Any) -> bool:
+    """Queue ``item`` without blocking; return True if an older item was dropped.
+
+    A stale event is worth less than a new one, so a full queue loses its
+    oldest entry rather than the caller waiting for the consumer.
+    """
+    try:
+        q.put_nowait(item)
+        return False
+    except queue.Full:
+        pass
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    try:
+        q.put_nowait(item)
+    except queue.Full:
+        pass
+    return True
@@ -3,20 +3,34 @@
 
 import numpy as np
 import sounddevice as sd
-import time
+from scipy import fft as sp_fft
 
 SAMPLE_RATE = 16000
 DURATION = 0.5  # Check every 0.5 seconds
+WINDOW_SAMPLES = int(DURATION * SAMPLE_RATE)
+
+# The window length never changes, so neither do the bin frequencies or the
+# 400-3000 Hz band edges (inclusive at both ends).
+FREQS = np.fft.rfftfreq(WINDOW_SAMPLES, 1.0 / SAMPLE_RATE)
+BAND_LO = int(np.searchsorted(FREQS, 400, side="left"))
+BAND_HI = int(np.searchsorted(FREQS, 3000, side="right"))
 
 def calculate_metrics(audio):
     """Calculate the same metrics used by the heuristic detector."""
-    rms = np.sqrt(np.mean(audio ** 2))
+    n = len(audio)
+    # scipy keeps float32 input in complex64; np.fft would promote to double.
+    fft = sp_fft.rfft(audio)
+    # vdot(x, x) is the sum of squared magnitudes in one pass, no temporary.
+    total = np.vdot(fft, fft).real
+
+    # Parseval: the spectrum already holds the signal energy. Bins other than
+    # DC (and Nyquist, for even n) stand for a mirrored negative bin too.
+    edges = abs(fft[0]) ** 2 + (abs(fft[-1]) ** 2 if n % 2 == 0 else 0.0)
+    energy = (2.0 * total - edges) / n
+    rms = np.sqrt(energy / n)
 
-    # Calculate band energy (400-3000 Hz)
-    fft = np.fft.rfft(audio)
-    freqs = np.fft.rfftfreq(len(audio), 1.0 / SAMPLE_RATE)
-    band_mask = (freqs >= 400) & (freqs <= 3000)
-    band_energy = np.sum(np.abs(fft[band_mask]) ** 2)
+    band = fft[BAND_LO:BAND_HI]
+    band_energy = np.vdot(band, band).real
 
     return rms, band_energy
 
@@ -28,31 +42,29 @@ print(f"  - RMS threshold: 0.08")
 print(f"  - Band energy minimum: 1.0e-4")
 print("\nPress Ctrl+C to stop\n")
 
+# One stream for the session; the blocking read() paces the loop.
 try:
-    while True:
-        # Record a short chunk
-        audio = sd.rec(
-            int(DURATION * SAMPLE_RATE),
-            samplerate=SAMPLE_RATE,
-            channels=1,
-            dtype='float32'
-        )
-        sd.wait()
-        audio = audio.flatten()
-
-        rms, band_energy = calculate_metrics(audio)
-
-        # Show if it would trigger detection
-        rms_pass = rms >= 0.08
-        energy_pass = band_energy >= 1.0e-4
-        both_pass = rms_pass and energy_pass
-
-        status = "🔴 WOULD DETECT" if both_pass else "⚪ Silent"
-
-        print(f"{status} | RMS: {rms:.4f} {'✓' if rms_pass else '✗'} | "
-              f"Band Energy: {band_energy:.2e} {'✓' if energy_pass else '✗'}")
-
-        time.sleep(0.1)
+    with sd.InputStream(
+        samplerate=SAMPLE_RATE,
+        channels=1,
+        dtype='float32',
+        blocksize=WINDOW_SAMPLES,
+    ) as stream:
+        while True:
+            audio, _overflowed = stream.read(WINDOW_SAMPLES)
+            audio = audio[:, 0]
+
+            rms, band_energy = calculate_metrics(audio)
+
+            # Show if it would trigger detection
+            rms_pass = rms >= 0.08
+            energy_pass = band_energy >= 1.0e-4
+            both_pass = rms_pass and energy_pass
+
+            status = "🔴 WOULD DETECT" if both_pass else "⚪ Silent"
+
+            print(f"{status} | RMS: {rms:.4f} {'✓' if rms_pass else '✗'} | "
+                  f"Band Energy: {band_energy:.2e} {'✓' if energy_pass else '✗'}")
 
 except KeyboardInterrupt:
     print("\n\n👋 Stopped")
@@ -4,7 +4,7 @@
 import sys
 import wave
 import numpy as np
-from detector.yamnet import YAMNetBarkDetector, YAMNetConfig
+from detector.yamnet import get_yamnet
 
 if len(sys.argv) < 2:
     print("Usage: python3 test_yamnet_file.py <wav_file>")
@@ -13,45 +13,59 @@ if len(sys.argv) < 2:
 wav_file = sys.argv[1]
 
 # Load YAMNet
-config = YAMNetConfig(
+print("Loading YAMNet...")
+detector = get_yamnet(
     model_url="https://huggingface.co/qualcomm/YamNet/resolve/main/YamNet_float.tflite",
     classes_url="https://raw.githubusercontent.com/tensorflow/models/master/research/audioset/yamnet/yamnet_class_map.csv",
     conf_threshold=0.01,
     label_substrings=("dog", "bark", "bow", "yip"),
 )
-
-print("Loading YAMNet...")
-detector = YAMNetBarkDetector(config)
 print(f"✅ YAMNet loaded")
 print(f"   Bark indices found: {detector._bark_indices}")
 print(f"   Total classes: {len(detector._bark_indices)}")
 
-# Load WAV file
+# Test in chunks
+window_size = 6144  # ~0.384s at 16kHz
+hop_size = 3072
+
+# Stream the WAV a hop at a time into one rolling float32 window, so memory
+# stays at one window however long the capture is.
 print(f"\nLoading WAV file: {wav_file}")
 with wave.open(wav_file, 'rb') as wf:
     sample_rate = wf.getframerate()
     n_frames = wf.getnframes()
-    audio_bytes = wf.readframes(n_frames)
-    audio = np.frombuffer(audio_bytes, dtype=np.int16).astype(np.float32) / 32768.0
+    print(f"   Sample rate: {sample_rate} Hz")
+    print(f"   Duration: {n_frames / sample_rate:.2f} seconds")
 
-print(f"   Sample rate: {sample_rate} Hz")
-print(f"   Duration: {len(audio) / sample_rate:.2f} seconds")
-print(f"   Audio range: [{audio.min():.3f}, {audio.max():.3f}]")
+    scratch = np.zeros(window_size, dtype=np.float32)
+    audio_min, audio_max = np.inf, -np.inf
 
-# Test in chunks
-window_size = 6144  # ~0.384s at 16kHz
-hop_size = 3072
+    def read_into(out):
+        """Convert the next len(out) frames into ``out``; return the filled part."""
+        pcm = np.frombuffer(wf.readframes(len(out)), dtype=np.int16)
+        filled = out[: pcm.size]
+        np.multiply(pcm, np.float32(1.0 / 32768.0), out=filled)
+        return filled
 
-print(f"\nProcessing audio in chunks...")
-max_score = 0.0
-for i in range(0, len(audio) - window_size, hop_size):
-    chunk = audio[i:i+window_size]
-    score = detector.score_bark(chunk)
-    if score > max_score:
-        max_score = score
-    if score > 0.0:
-        print(f"   Time {i/sample_rate:.2f}s: bark score = {score:.4f}")
+    print(f"\nProcessing audio in chunks...")
+    max_score = 0.0
+    for i in range(0, n_frames - window_size, hop_size):
+        if i:
+            scratch[:-hop_size] = scratch[hop_size:]
+            fresh = read_into(scratch[-hop_size:])
+        else:
+            fresh = read_into(scratch)
+        if fresh.size:
+            audio_min = min(audio_min, float(fresh.min()))
+            audio_max = max(audio_max, float(fresh.max()))
+        score = detector.score_bark(scratch)
+        if score > max_score:
+            max_score = score
+        if score > 0.0:
+            print(f"   Time {i/sample_rate:.2f}s: bark score = {score:.4f}")
 
+if audio_max >= audio_min:
+    print(f"   Audio range: [{audio_min:.3f}, {audio_max:.3f}]")
 print(f"\n📊 Maximum bark score: {max_score:.4f}")
 if max_score >= 0.01:
     print("✅ BARK DETECTED!")
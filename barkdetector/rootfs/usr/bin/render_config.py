@@ -61,6 +61,9 @@ def build_config(options: dict) -> dict:
                 ),
                 "conf_threshold": threshold,
                 "label_substrings": ["dog", "bark", "yip", "bow-wow", "howl"],
+                "quantized": bool(options.get("yamnet_quantized", False)),
+                "quantized_model_url": str(options.get("yamnet_quantized_model_url") or "").strip(),
+                "gate_rms": float(options.get("silence_gate", 0.0)),
             },
             "normalize": {
                 "enabled": bool(options.get("normalize_windows", False)),